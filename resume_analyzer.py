@@ -1,112 +1,473 @@
 import os
 import re
+import copy
+import heapq
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from importlib import metadata
 import numpy as np
+import torch
 import traceback
 from typing import Dict, List, Any, Tuple
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from utils import parse_resume_sections
+from utils import parse_resume_sections, build_keyword_automaton
+
+try:
+    import intel_extension_for_pytorch as ipex
+except ImportError:
+    ipex = None
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+except ImportError:
+    ort = None
 
 _model = None
+# Serialises loading so the background warm-up and a request never both load
+_model_lock = threading.Lock()
+
+# True once IPEX has converted the PyTorch encoder to BF16 (encode then autocasts)
+_use_bf16 = False
+
+_MODEL_CACHE_DIR = "./model_cache"
+
+
+
+def _package_version(name: str) -> str:
+    """Installed version of a distribution, or 'unknown'"""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# Dynamically int8-quantized ONNX export of the encoder, used when onnxruntime is
+# installed. The file name pins the library versions, so an upgrade re-exports.
+_INT8_ONNX_PATH = os.path.join(
+    _MODEL_CACHE_DIR,
+    "all-MiniLM-L6-v2.int8.{}.onnx".format("-".join(
+        f"{name}{_package_version(name)}"
+        for name in ("torch", "sentence-transformers", "transformers", "onnxruntime")
+    ))
+)
+
+# Encoder context length in tokens (the model's native 256) and character
+# budgets that stay safely under a token limit for English text, so the
+# tokenizer never processes discarded input. The JD and whole-resume rows keep
+# the full context; sections need only about half of it for a relevance signal.
+_MAX_SEQ_LENGTH = 256
+_MAX_DOCUMENT_CHARS = 1200
+_MAX_SECTION_CHARS = 600
+
+# Quantifiable-metric patterns (%, multipliers, money, counts) as one alternation
+_METRIC_RE = re.compile(
+    r'\d+%|\d+x|\$\d+|\d+\+|\d+k|\d+ (?:users|customers|projects|hours|days|months)'
+)
+
+# Resume-wide metric check and number extraction for rewrite suggestions
+_RESUME_METRIC_RE = re.compile(r'\d+%|\d+x|\$\d+')
+_NUMBER_RE = re.compile(r'\d+')
+
+# Weak bullet detection
+_WEAK_ACTIONS = (
+    'worked on', 'helped', 'involved', 'participated', 'did',
+    'made', 'was responsible', 'handled', 'dealt with'
+)
+# Bullet spans: runs between separators, already trimmed of surrounding whitespace
+_BULLET_RE = re.compile(r'[^\n•·\-\*\s](?:[^\n•·\-\*]*[^\n•·\-\*\s])?')
+
+# Weak actions and bullet metrics in one alternation so each bullet is scanned once.
+# The branches cannot overlap (weak actions are words, metrics start with a digit or '$').
+_WEAK_OR_METRIC_RE = re.compile(
+    '(?P<weak>' + '|'.join(map(re.escape, _WEAK_ACTIONS)) + ')'
+    r'|(?P<metric>\d+%|\d+x|\d+\+|\$\d+)'
+)
+
+
+class _EncoderForExport(torch.nn.Module):
+    """Wraps the HF transformer so the ONNX graph returns only token embeddings"""
+    
+    def __init__(self, auto_model):
+        super().__init__()
+        self.auto_model = auto_model
+    
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.auto_model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids
+        )[0]
+
+
+def _export_int8_onnx(model) -> None:
+    """Export the encoder to ONNX and quantize its weights to int8"""
+    # Unique scratch files, so concurrent exports never clobber each other
+    os.makedirs(_MODEL_CACHE_DIR, exist_ok=True)
+    scratch = []
+    for suffix in (".fp32.onnx", ".int8.onnx"):
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=_MODEL_CACHE_DIR)
+        os.close(fd)
+        scratch.append(path)
+    fp32_path, int8_path = scratch
+    dummy = model.tokenizer(["resume"], return_tensors="pt")
+    
+    try:
+        torch.onnx.export(
+            _EncoderForExport(model[0].auto_model).eval(),
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["token_embeddings"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "token_type_ids": {0: "batch", 1: "seq"},
+                "token_embeddings": {0: "batch", 1: "seq"},
+            },
+            opset_version=14
+        )
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        # Publish atomically: an interrupted export never leaves a truncated model
+        os.replace(int8_path, _INT8_ONNX_PATH)
+    finally:
+        # Newer exporters may spill weights into a sidecar ".data" file
+        for path in (fp32_path, fp32_path + ".data", int8_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class Int8OnnxEncoder:
+    """
+    Drop-in replacement for SentenceTransformer.encode backed by an int8 ONNX
+    Runtime session (VNNI int8 matmuls on modern x86, half the weight memory).
+    Reuses the SentenceTransformer tokenizer and applies mean pooling.
+    """
+    
+    def __init__(self, session, tokenizer, max_seq_length: int):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_seq_length = max_seq_length
+        self._input_names = [i.name for i in session.get_inputs()]
+    
+    def encode(self, sentences: List[str], batch_size: int = 32,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        batches = []
+        for i in range(0, len(sentences), batch_size):
+            features = self.tokenizer(
+                sentences[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            inputs = {name: features[name].astype(np.int64) for name in self._input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+            
+            # Mean pooling over non-padding tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+        
+        embeddings = np.concatenate(batches).astype(np.float32, copy=False)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        return embeddings
+
+
+def _load_int8_encoder(model):
+    """Build the int8 ONNX encoder, exporting it on first use (None if unavailable)"""
+    if ort is None:
+        return None
+    try:
+        if not os.path.exists(_INT8_ONNX_PATH):
+            _export_int8_onnx(model)
+        try:
+            session = ort.InferenceSession(
+                _INT8_ONNX_PATH,
+                sess_options=_ort_session_options(),
+                providers=["CPUExecutionProvider"]
+            )
+        except Exception:
+            # Unreadable export (e.g. from an older build): drop it so the next load re-exports
+            os.remove(_INT8_ONNX_PATH)
+            raise
+        return Int8OnnxEncoder(session, model.tokenizer, model.max_seq_length)
+    except Exception as e:
+        print(f"Int8 ONNX encoder unavailable, using PyTorch model: {e}")
+        return None
+
+
+def _intra_op_threads() -> int:
+    """Encoder compute threads: every core but one, which is left for the app"""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _ort_session_options():
+    """ONNX Runtime options with the same thread layout as the PyTorch encoder"""
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = _intra_op_threads()
+    options.inter_op_num_threads = 1
+    return options
+
+
+def _configure_torch_threads() -> None:
+    """Leave one core for the app and avoid inter-op oversubscription"""
+    torch.set_num_threads(_intra_op_threads())
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before any inter-op parallel work has started
+        pass
+
+
+def _optimize_with_ipex(model) -> bool:
+    """Convert the transformer to IPEX BF16 kernels (AMX/AVX-512 BF16) if available"""
+    if ipex is None:
+        return False
+    try:
+        transformer = model[0]
+        transformer.auto_model = ipex.optimize(transformer.auto_model.eval(), dtype=torch.bfloat16)
+        return True
+    except Exception as e:
+        print(f"IPEX optimization skipped: {e}")
+        return False
 
 
 def get_model():
     """Lazy load model with caching"""
-    global _model
-    if _model is None:
-        _model = SentenceTransformer(
-            "all-MiniLM-L6-v2",
-            cache_folder="./model_cache",
-            device="cpu"
-        )
+    global _model, _use_bf16
+    if _model is not None:
+        return _model
+    with _model_lock:
+        if _model is None:
+            _configure_torch_threads()
+            model = SentenceTransformer(
+                "all-MiniLM-L6-v2",
+                cache_folder=_MODEL_CACHE_DIR,
+                device="cpu"
+            )
+            model.max_seq_length = _MAX_SEQ_LENGTH
+            model.eval()
+            encoder = _load_int8_encoder(model)
+            if encoder is None:
+                _use_bf16 = _optimize_with_ipex(model)
+            _model = encoder or model
     return _model
 
 
+def _warm_up_model():
+    """Load the model off the request path; failures are retried on first use"""
+    try:
+        get_model()
+    except Exception as e:
+        print(f"Background model load failed: {e}")
+
+
 def normalize_score(value: float) -> int:
     """Normalize score to 0-100 range"""
     value = max(0, min(value, 100))
     return int(value)
 
 
+def _digest(text: str) -> bytes:
+    """Compact content key, so caches never hold the raw resume/JD text"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+# Recent embeddings keyed by digest of the (truncated) encoded text. Kept in
+# memory only: resumes and anything derived from them are never written to disk.
+_EMBEDDING_CACHE_SIZE = 512
+_embedding_cache = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def encode_texts(model, texts: List[str], max_chars: List[int] = None) -> np.ndarray:
+    """
+    Encode texts into unit-norm (n, dim) embeddings without autograd tracking.
+    
+    max_chars gives each text's character budget (default _MAX_SECTION_CHARS).
+    Only texts missing from the embedding cache reach the encoder, so a resume
+    re-analysed against a new JD (or vice versa) is not re-encoded.
+    """
+    if max_chars is None:
+        max_chars = [_MAX_SECTION_CHARS] * len(texts)
+    
+    # Truncate to the encoder's context so no tokenizer work is wasted
+    truncated = [text[:limit] for text, limit in zip(texts, max_chars)]
+    keys = [_digest(text) for text in truncated]
+    
+    embeddings = {}
+    with _embedding_cache_lock:
+        for key in keys:
+            if key in _embedding_cache:
+                _embedding_cache.move_to_end(key)
+                embeddings[key] = _embedding_cache[key]
+    
+    # Deduplicated misses, encoded in a single batch
+    missing = {key: text for key, text in zip(keys, truncated) if key not in embeddings}
+    if missing:
+        with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16, enabled=_use_bf16):
+            encoded = model.encode(
+                list(missing.values()),
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        
+        with _embedding_cache_lock:
+            for key, embedding in zip(missing, encoded):
+                embeddings[key] = embedding
+                _embedding_cache[key] = embedding
+                _embedding_cache.move_to_end(key)
+            while len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+    
+    return np.stack([embeddings[key] for key in keys])
+
+
+def compute_similarities(model, job_desc: str, texts: List[str],
+                         max_chars: List[int] = None) -> Tuple[np.ndarray, bool]:
+    """
+    Similarity of every text to the job description from one encode call,
+    plus False if encoding failed and the neutral 0.50 fallback was used.
+    
+    The JD and all eligible texts are encoded together as unit-norm rows, so
+    cosine similarity reduces to one matrix-vector product against the JD row.
+    The JD keeps the full document budget; max_chars gives each text's budget
+    (default _MAX_SECTION_CHARS). Empty or whitespace-only texts score 0 and
+    are never encoded.
+    """
+    similarities = np.zeros(len(texts), dtype=np.float32)
+    if max_chars is None:
+        max_chars = [_MAX_SECTION_CHARS] * len(texts)
+    
+    # Long texts are cut to their budget in encode_texts
+    indices = [i for i, text in enumerate(texts) if text and not text.isspace()]
+    if not indices or not job_desc or job_desc.isspace():
+        return similarities, True
+    
+    try:
+        embeddings = encode_texts(
+            model,
+            [job_desc] + [texts[i] for i in indices],
+            [_MAX_DOCUMENT_CHARS] + [max_chars[i] for i in indices]
+        )
+        E = np.ascontiguousarray(embeddings, dtype=np.float32)
+        
+        similarities[indices] = np.clip(E[1:] @ E[0], 0.0, 1.0)
+    except Exception as e:
+        print(f"Similarity computation error: {e}")
+        similarities[indices] = 0.50
+        return similarities, False
+    
+    return similarities, True
+
+
 def compute_similarity(model, text_a: str, text_b: str) -> float:
     """Compute semantic similarity between two texts"""
     try:
         if not text_a.strip() or not text_b.strip():
             return 0.0
         
-        # Truncate to prevent memory issues
-        text_a = text_a[:2000]
-        text_b = text_b[:2000]
-        
-        embedding_a = model.encode([text_a])
-        embedding_b = model.encode([text_b])
+        embeddings = encode_texts(model, [text_a, text_b], [_MAX_DOCUMENT_CHARS] * 2)
         
-        similarity = float(cosine_similarity(embedding_a, embedding_b)[0][0])
+        # Rows are unit-norm, so cosine similarity is a plain dot product
+        similarity = float(np.dot(embeddings[0], embeddings[1]))
         return max(0.0, min(1.0, similarity))
     except Exception as e:
         print(f"Similarity computation error: {e}")
         return 0.50
 
 
-def extract_keywords(text: str) -> set:
-    """Extract technical keywords from text"""
-    tech_keywords = {
-        # Programming Languages
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 
-        'ruby', 'go', 'rust', 'kotlin', 'swift', 'r', 'matlab', 'scala',
-        
-        # Web Technologies
-        'html', 'css', 'react', 'angular', 'vue', 'node', 'nodejs', 'express',
-        'django', 'flask', 'fastapi', 'spring', 'asp.net', 'nextjs', 'nuxt',
-        
-        # Databases
-        'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra', 
-        'elasticsearch', 'oracle', 'sqlite', 'dynamodb', 'firebase',
-        
-        # Cloud & DevOps
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'ci/cd',
-        'terraform', 'ansible', 'git', 'github', 'gitlab', 'bitbucket',
-        
-        # AI/ML
-        'tensorflow', 'pytorch', 'scikit-learn', 'keras', 'nlp', 'computer vision',
-        'deep learning', 'machine learning', 'neural networks', 'pandas', 'numpy',
-        'data analysis', 'data science', 'opencv', 'huggingface', 'transformers',
-        
-        # Mobile
-        'android', 'ios', 'react native', 'flutter', 'xamarin',
-        
-        # Data Engineering
-        'spark', 'hadoop', 'airflow', 'kafka', 'etl', 'data pipeline',
-        'bigquery', 'snowflake', 'databricks',
-        
-        # Testing & Quality
-        'pytest', 'junit', 'selenium', 'jest', 'cypress', 'unit testing',
-        
-        # Other
-        'rest api', 'graphql', 'microservices', 'agile', 'scrum', 'jira',
-        'linux', 'unix', 'bash', 'powershell', 'api', 'json', 'xml'
-    }
+_TECH_KEYWORDS = frozenset({
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 
+    'ruby', 'go', 'rust', 'kotlin', 'swift', 'r', 'matlab', 'scala',
+    
+    # Web Technologies
+    'html', 'css', 'react', 'angular', 'vue', 'node', 'nodejs', 'express',
+    'django', 'flask', 'fastapi', 'spring', 'asp.net', 'nextjs', 'nuxt',
+    
+    # Databases
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra', 
+    'elasticsearch', 'oracle', 'sqlite', 'dynamodb', 'firebase',
+    
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'ci/cd',
+    'terraform', 'ansible', 'git', 'github', 'gitlab', 'bitbucket',
+    
+    # AI/ML
+    'tensorflow', 'pytorch', 'scikit-learn', 'keras', 'nlp', 'computer vision',
+    'deep learning', 'machine learning', 'neural networks', 'pandas', 'numpy',
+    'data analysis', 'data science', 'opencv', 'huggingface', 'transformers',
+    
+    # Mobile
+    'android', 'ios', 'react native', 'flutter', 'xamarin',
+    
+    # Data Engineering
+    'spark', 'hadoop', 'airflow', 'kafka', 'etl', 'data pipeline',
+    'bigquery', 'snowflake', 'databricks',
+    
+    # Testing & Quality
+    'pytest', 'junit', 'selenium', 'jest', 'cypress', 'unit testing',
+    
+    # Other
+    'rest api', 'graphql', 'microservices', 'agile', 'scrum', 'jira',
+    'linux', 'unix', 'bash', 'powershell', 'api', 'json', 'xml'
+})
+
+
+_STRONG_VERBS = (
+    'developed', 'built', 'created', 'designed', 'implemented',
+    'engineered', 'architected', 'optimized', 'improved', 'increased',
+    'reduced', 'managed', 'led', 'coordinated', 'established',
+    'launched', 'delivered', 'achieved', 'spearheaded', 'pioneered'
+)
+
+_WEAK_PHRASES = (
+    'worked on', 'helped with', 'assisted in', 'was responsible for',
+    'duties included', 'tasks included', 'involved in'
+)
+
+
+# Single-pass multi-pattern matcher; reports overlapping hits exactly like `in`
+_TECH_AUTOMATON = build_keyword_automaton(_TECH_KEYWORDS)
+
+
+def extract_keywords(text_lower: str) -> set:
+    """Extract technical keywords from already-lowercased text"""
+    if _TECH_AUTOMATON is not None:
+        return {keyword for _, keyword in _TECH_AUTOMATON.iter(text_lower)}
     
-    text_lower = text.lower()
-    found = {keyword for keyword in tech_keywords if keyword in text_lower}
+    found = {keyword for keyword in _TECH_KEYWORDS if keyword in text_lower}
     
     return found
 
 
-def calculate_dynamic_section_score(section_content: str, job_desc: str, model, section_type: str) -> Tuple[int, Dict[str, Any]]:
+def calculate_dynamic_section_score(section_content: str, similarity: float, jd_keywords: set,
+                                    section_type: str) -> Tuple[int, Dict[str, Any]]:
     """
     Calculate dynamic score for a section based on:
     1. Content quality
     2. Relevance to job description
     3. Keyword density
     4. Quantifiable metrics presence
+    
+    similarity comes from compute_similarities (one batched encode for the
+    JD, resume and all sections); jd_keywords is computed once per JD.
     """
     
-    if not section_content.strip():
+    if not section_content or section_content.isspace():
         return 0, {"reason": "Empty section", "suggestions": ["Add content to this section"]}
     
+    word_count = len(section_content.split())
+    content_lower = section_content.lower()
+    
     # Base similarity score (0-100)
-    similarity = compute_similarity(model, section_content, job_desc)
+    similarity = float(similarity)
     base_score = similarity * 100
     
     # Quality metrics
@@ -115,7 +476,6 @@ def calculate_dynamic_section_score(section_content: str, job_desc: str, model,
     details = {}
     
     # 1. Length check
-    word_count = len(section_content.split())
     details['word_count'] = word_count
     
     if section_type == "summary":
@@ -151,16 +511,7 @@ def calculate_dynamic_section_score(section_content: str, job_desc: str, model,
             suggestions.append("Include GPA/CGPA and relevant coursework")
     
     # 2. Check for quantifiable metrics
-    metrics_patterns = [
-        r'\d+%',  # Percentages
-        r'\d+x',  # Multipliers
-        r'\$\d+', # Money
-        r'\d+\+', # Plus numbers
-        r'\d+k',  # Thousands
-        r'\d+ (users|customers|projects|hours|days|months)',  # Counts
-    ]
-    
-    has_metrics = any(re.search(pattern, section_content.lower()) for pattern in metrics_patterns)
+    has_metrics = bool(_METRIC_RE.search(content_lower))
     
     if has_metrics:
         quality_score += 15
@@ -172,14 +523,7 @@ def calculate_dynamic_section_score(section_content: str, job_desc: str, model,
     
     # 3. Check for action verbs (for experience/projects)
     if section_type in ["experience", "projects"]:
-        strong_verbs = [
-            'developed', 'built', 'created', 'designed', 'implemented',
-            'engineered', 'architected', 'optimized', 'improved', 'increased',
-            'reduced', 'managed', 'led', 'coordinated', 'established',
-            'launched', 'delivered', 'achieved', 'spearheaded', 'pioneered'
-        ]
-        
-        verb_count = sum(1 for verb in strong_verbs if verb in section_content.lower())
+        verb_count = sum(1 for verb in _STRONG_VERBS if verb in content_lower)
         
         if verb_count >= 3:
             quality_score += 10
@@ -189,8 +533,7 @@ def calculate_dynamic_section_score(section_content: str, job_desc: str, model,
             details['strong_verbs'] = verb_count
     
     # 4. Keyword alignment with job description
-    section_keywords = extract_keywords(section_content)
-    jd_keywords = extract_keywords(job_desc)
+    section_keywords = extract_keywords(content_lower)
     
     if jd_keywords:
         keyword_overlap = len(section_keywords & jd_keywords)
@@ -201,12 +544,7 @@ def calculate_dynamic_section_score(section_content: str, job_desc: str, model,
         details['keyword_match_ratio'] = f"{keyword_match_ratio:.2%}"
     
     # 5. Check for weak phrases
-    weak_phrases = [
-        'worked on', 'helped with', 'assisted in', 'was responsible for',
-        'duties included', 'tasks included', 'involved in'
-    ]
-    
-    has_weak_phrases = any(phrase in section_content.lower() for phrase in weak_phrases)
+    has_weak_phrases = any(phrase in content_lower for phrase in _WEAK_PHRASES)
     
     if has_weak_phrases:
         quality_score -= 10
@@ -224,114 +562,173 @@ def calculate_dynamic_section_score(section_content: str, job_desc: str, model,
     return final_score, {"details": details, "suggestions": suggestions}
 
 
-def detect_role_from_jd(job_desc: str) -> str:
-    """Enhanced role detection from job description"""
-    jd_lower = job_desc.lower()
-    
-    role_patterns = {
-        "Data Scientist": [
-            "data scien", "machine learning", "ml engineer", "statistical analysis",
-            "predictive model", "data mining"
-        ],
-        "AI/ML Engineer": [
-            "ai engineer", "ml engineer", "deep learning", "neural network",
-            "nlp", "computer vision", "artificial intelligence"
-        ],
-        "Software Engineer": [
-            "software engineer", "software developer", "backend", "frontend",
-            "full stack", "application developer"
-        ],
-        "Data Analyst": [
-            "data analyst", "business analyst", "tableau", "power bi",
-            "data visualization", "reporting"
-        ],
-        "DevOps Engineer": [
-            "devops", "site reliability", "ci/cd", "docker", "kubernetes",
-            "infrastructure", "cloud engineer"
-        ],
-        "Web Developer": [
-            "web developer", "frontend developer", "react developer",
-            "html", "css", "javascript developer"
-        ],
-        "Mobile Developer": [
-            "mobile developer", "android developer", "ios developer",
-            "flutter", "react native"
-        ],
-        "Data Engineer": [
-            "data engineer", "etl", "data pipeline", "spark", "hadoop",
-            "data warehouse"
-        ],
-        "Product Manager": [
-            "product manager", "product owner", "product management",
-            "roadmap", "stakeholder"
-        ],
-        "UI/UX Designer": [
-            "ui designer", "ux designer", "user experience", "figma",
-            "user interface", "wireframe"
-        ]
-    }
-    
-    best_role = "General"
-    max_hits = 0
+_ROLE_PATTERNS = {
+    "Data Scientist": [
+        "data scien", "machine learning", "ml engineer", "statistical analysis",
+        "predictive model", "data mining"
+    ],
+    "AI/ML Engineer": [
+        "ai engineer", "ml engineer", "deep learning", "neural network",
+        "nlp", "computer vision", "artificial intelligence"
+    ],
+    "Software Engineer": [
+        "software engineer", "software developer", "backend", "frontend",
+        "full stack", "application developer"
+    ],
+    "Data Analyst": [
+        "data analyst", "business analyst", "tableau", "power bi",
+        "data visualization", "reporting"
+    ],
+    "DevOps Engineer": [
+        "devops", "site reliability", "ci/cd", "docker", "kubernetes",
+        "infrastructure", "cloud engineer"
+    ],
+    "Web Developer": [
+        "web developer", "frontend developer", "react developer",
+        "html", "css", "javascript developer"
+    ],
+    "Mobile Developer": [
+        "mobile developer", "android developer", "ios developer",
+        "flutter", "react native"
+    ],
+    "Data Engineer": [
+        "data engineer", "etl", "data pipeline", "spark", "hadoop",
+        "data warehouse"
+    ],
+    "Product Manager": [
+        "product manager", "product owner", "product management",
+        "roadmap", "stakeholder"
+    ],
+    "UI/UX Designer": [
+        "ui designer", "ux designer", "user experience", "figma",
+        "user interface", "wireframe"
+    ]
+}
+
+# Flattened role phrases with the index of their owning role, so role hits can
+# be tallied with one vectorised reduction instead of a nested loop
+_ROLE_NAMES = list(_ROLE_PATTERNS.keys())
+_ROLE_PHRASES = [kw for keywords in _ROLE_PATTERNS.values() for kw in keywords]
+_ROLE_INDEX = np.array(
+    [i for i, keywords in enumerate(_ROLE_PATTERNS.values()) for _ in keywords],
+    dtype=np.intp
+)
+
+# Positions of each distinct phrase in _ROLE_PHRASES (a phrase may serve several
+# roles), so one automaton pass over the JD fills the whole presence vector
+_ROLE_PHRASE_POSITIONS = {
+    phrase: [i for i, other in enumerate(_ROLE_PHRASES) if other == phrase]
+    for phrase in _ROLE_PHRASES
+}
+_ROLE_AUTOMATON = build_keyword_automaton(_ROLE_PHRASE_POSITIONS)
+
+
+def detect_role_from_jd(jd_lower: str) -> str:
+    """Enhanced role detection from an already-lowercased job description"""
+    if _ROLE_AUTOMATON is not None:
+        hits = np.zeros(len(_ROLE_PHRASES), dtype=np.uint8)
+        for phrase in {phrase for _, phrase in _ROLE_AUTOMATON.iter(jd_lower)}:
+            hits[_ROLE_PHRASE_POSITIONS[phrase]] = 1
+    else:
+        hits = np.fromiter(
+            (phrase in jd_lower for phrase in _ROLE_PHRASES),
+            dtype=np.uint8,
+            count=len(_ROLE_PHRASES)
+        )
+    role_hits = np.bincount(_ROLE_INDEX, weights=hits, minlength=len(_ROLE_NAMES))
     
-    for role, keywords in role_patterns.items():
-        hits = sum(1 for keyword in keywords if keyword in jd_lower)
-        if hits > max_hits:
-            best_role = role
-            max_hits = hits
+    # argmax keeps the first role on ties, matching the previous strict '>' scan
+    best = int(np.argmax(role_hits))
+    if role_hits[best] <= 0:
+        return "General"
     
-    return best_role
+    return _ROLE_NAMES[best]
 
 
-def find_weak_bullets(resume_text: str) -> List[str]:
+def find_weak_bullets(resume_text: str, resume_lower: str = None) -> List[str]:
     """Find weak bullet points that need improvement"""
+    if resume_lower is None:
+        resume_lower = resume_text.lower()
     
-    # Split into potential bullet points
-    bullets = re.split(r'[\n•·\-\*]\s*', resume_text)
-    
-    weak_bullets = []
-    weak_actions = [
-        'worked on', 'helped', 'involved', 'participated', 'did',
-        'made', 'was responsible', 'handled', 'dealt with'
+    # Candidate bullets, skipping short/long lines
+    spans = [
+        m.span() for m in _BULLET_RE.finditer(resume_text)
+        if 20 <= m.end() - m.start() <= 200
     ]
+    if not spans:
+        return []
+    
+    # Lowercasing can change length for a few Unicode characters; spans found on
+    # the original text only line up with the lowered text when lengths agree
+    if len(resume_lower) != len(resume_text):
+        return [
+            resume_text[start:end] for start, end in spans
+            if _is_weak_bullet(resume_text[start:end].lower())
+        ]
     
-    for bullet in bullets:
-        bullet = bullet.strip()
-        
-        # Skip short lines
-        if len(bullet) < 20 or len(bullet) > 200:
-            continue
-        
-        # Check for weak action words
-        has_weak_action = any(action in bullet.lower() for action in weak_actions)
-        
-        # Check for lack of metrics
-        has_metrics = bool(re.search(r'\d+%|\d+x|\d+\+|\$\d+', bullet.lower()))
-        
-        if has_weak_action and not has_metrics:
-            weak_bullets.append(bullet)
+    starts = np.fromiter((start for start, _ in spans), dtype=np.intp, count=len(spans))
+    ends = np.fromiter((end for _, end in spans), dtype=np.intp, count=len(spans))
+    
+    # One scan over the whole resume; patterns never contain a bullet separator,
+    # so every match falls inside exactly one separator-free run
+    weak_pos = []
+    metric_pos = []
+    for m in _WEAK_OR_METRIC_RE.finditer(resume_lower):
+        (metric_pos if m.lastgroup == 'metric' else weak_pos).append(m.start())
     
-    return weak_bullets
+    is_weak = _bullet_mask(weak_pos, starts, ends)
+    has_metrics = _bullet_mask(metric_pos, starts, ends)
+    
+    return [
+        resume_text[start:end]
+        for (start, end), flag in zip(spans, is_weak & ~has_metrics)
+        if flag
+    ]
+
+
+def _bullet_mask(positions: List[int], starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Boolean mask of bullets (given as sorted [start, end) spans) containing any position"""
+    mask = np.zeros(len(starts), dtype=bool)
+    if not positions:
+        return mask
+    
+    pos = np.asarray(positions, dtype=np.intp)
+    idx = np.searchsorted(starts, pos, side='right') - 1
+    inside = idx >= 0
+    inside[inside] = pos[inside] < ends[idx[inside]]
+    mask[idx[inside]] = True
+    return mask
+
+
+def _is_weak_bullet(bullet_lower: str) -> bool:
+    """Weak action present and no metric, in a single regex scan"""
+    has_weak_action = False
+    for m in _WEAK_OR_METRIC_RE.finditer(bullet_lower):
+        if m.lastgroup == 'metric':
+            return False
+        has_weak_action = True
+    return has_weak_action
+
+
+_ROLE_VERBS = {
+    "Data Scientist": "Developed",
+    "AI/ML Engineer": "Engineered",
+    "Software Engineer": "Built",
+    "Data Analyst": "Analyzed",
+    "DevOps Engineer": "Automated",
+    "Web Developer": "Designed",
+    "Data Engineer": "Architected"
+}
 
 
 def generate_rewrite_suggestion(weak_bullet: str, detected_role: str, tech_stack: List[str]) -> str:
     """Generate improved version of weak bullet point"""
     
     # Extract any existing numbers/metrics
-    numbers = re.findall(r'\d+', weak_bullet)
+    numbers = _NUMBER_RE.findall(weak_bullet)
     
     # Use role-specific action verbs
-    role_verbs = {
-        "Data Scientist": "Developed",
-        "AI/ML Engineer": "Engineered",
-        "Software Engineer": "Built",
-        "Data Analyst": "Analyzed",
-        "DevOps Engineer": "Automated",
-        "Web Developer": "Designed",
-        "Data Engineer": "Architected"
-    }
-    
-    verb = role_verbs.get(detected_role, "Developed")
+    verb = _ROLE_VERBS.get(detected_role, "Developed")
     
     # Select relevant tech
     tech = ", ".join(tech_stack[:2]) if len(tech_stack) >= 2 else (tech_stack[0] if tech_stack else "modern tools")
@@ -344,22 +741,105 @@ def generate_rewrite_suggestion(weak_bullet: str, detected_role: str, tech_stack
     return suggestion
 
 
+# Recent analysis results keyed by content digests of (resume, JD)
+_ANALYSIS_CACHE_SIZE = 64
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# Result fields quoting the resume verbatim; never cached, rebuilt on a hit
+_RESUME_TEXT_FIELDS = ("weak_bullet", "weak_bullets")
+
+_DEFAULT_WEAK_BULLET = "Worked on a project without metrics"
+
+
+def _analysis_cache_key(resume_text: str, job_desc: str) -> Tuple[bytes, bytes]:
+    """Digest both inputs so the cache does not hold full resume/JD strings"""
+    return _digest(resume_text), _digest(job_desc)
+
+
+def _cache_analysis(key: Tuple[bytes, bytes], result: Dict[str, Any]) -> None:
+    """Store a result minus its resume quotes, evicting the least recently used entry when full"""
+    entry = copy.deepcopy({k: v for k, v in result.items() if k not in _RESUME_TEXT_FIELDS})
+    with _analysis_cache_lock:
+        _analysis_cache[key] = entry
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+
+def _cached_analysis(key: Tuple[bytes, bytes], resume_text: str) -> Dict[str, Any]:
+    """Copy of a cached result with its resume quotes rebuilt, or None on a miss"""
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is None:
+            return None
+        _analysis_cache.move_to_end(key)
+        result = copy.deepcopy(cached)
+    
+    weak_bullets = find_weak_bullets(resume_text)
+    result["weak_bullet"] = weak_bullets[0] if weak_bullets else _DEFAULT_WEAK_BULLET
+    result["weak_bullets"] = weak_bullets[:3]
+    return result
+
+
+def _empty_input_result(missing: List[str]) -> Dict[str, Any]:
+    """All-zero result for a blank resume and/or job description"""
+    return {
+        "ats_score": 0,
+        "global_similarity": "0%",
+        "section_scores": {
+            "summary": 0,
+            "skills": 0,
+            "experience": 0,
+            "projects": 0,
+            "education": 0
+        },
+        "section_details": {},
+        "missing_keywords": [],
+        "extra_keywords": [],
+        "detected_role": "General",
+        "weak_bullet": "",
+        "weak_bullets": [],
+        "rewrite_suggestion": "",
+        "suggestions": [f"No {' or '.join(missing)} provided - nothing to analyze"],
+        "tech_stack": [],
+        "word_count": 0,
+        "sections_found": []
+    }
+
+
 def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
     """
     Comprehensive resume analysis with dynamic section scoring
+    
+    Results are deterministic for a given (resume, JD) pair, so repeat
+    submissions are served from an LRU cache without touching the encoder.
+    Results computed with the encoder fallback are not cached.
     """
     try:
+        # Validate inputs (isspace avoids copying the whole text just to test it).
+        # Scores against a blank input are meaningless, so skip the pipeline entirely.
+        missing_inputs = []
+        if not resume_text or resume_text.isspace():
+            missing_inputs.append("resume text")
+        if not job_desc or job_desc.isspace():
+            missing_inputs.append("job description")
+        if missing_inputs:
+            return _empty_input_result(missing_inputs)
+        
+        cache_key = _analysis_cache_key(resume_text, job_desc)
+        cached = _cached_analysis(cache_key, resume_text)
+        if cached is not None:
+            return cached
+        
         model = get_model()
         
-        # Validate inputs
-        if not resume_text.strip():
-            resume_text = "No resume text provided"
-        if not job_desc.strip():
-            job_desc = "No job description provided"
+        # Lowercased once; every keyword, role and bullet pass below shares these
+        resume_lower = resume_text.lower()
+        jd_lower = job_desc.lower()
         
-        # ========== GLOBAL ATS SCORE ==========
-        global_similarity = compute_similarity(model, resume_text, job_desc)
-        global_ats_score = normalize_score(global_similarity * 100)
+        # ========== JOB DESCRIPTION (computed once) ==========
+        jd_keywords = extract_keywords(jd_lower)
         
         # ========== SECTION EXTRACTION ==========
         sections = parse_resume_sections(resume_text)
@@ -377,11 +857,22 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
         section_details = {}
         weighted_total = 0
         
-        for sec, weight in section_weights.items():
-            content = sections.get(sec, "").strip()
-            
+        # One encode call + matmul for the resume and every section; the
+        # whole-resume row keeps the full context for the global score
+        contents = [sections.get(sec, "").strip() for sec in section_weights]
+        similarities, encoded = compute_similarities(
+            model, job_desc, [resume_text] + contents,
+            [_MAX_DOCUMENT_CHARS] + [_MAX_SECTION_CHARS] * len(contents)
+        )
+        
+        # ========== GLOBAL ATS SCORE ==========
+        word_count = len(resume_text.split())
+        global_similarity = float(similarities[0])
+        global_ats_score = normalize_score(global_similarity * 100)
+        
+        for (sec, weight), content, similarity in zip(section_weights.items(), contents, similarities[1:]):
             score, details = calculate_dynamic_section_score(
-                content, job_desc, model, sec
+                content, similarity, jd_keywords, sec
             )
             
             section_scores[sec] = score
@@ -393,18 +884,20 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
         final_ats = normalize_score(final_ats)
         
         # ========== KEYWORD ANALYSIS ==========
-        resume_keywords = extract_keywords(resume_text)
-        jd_keywords = extract_keywords(job_desc)
+        resume_keywords = extract_keywords(resume_lower)
+        
+        missing_set = jd_keywords - resume_keywords
         
-        missing_keywords = sorted(list(jd_keywords - resume_keywords))
-        extra_keywords = sorted(list(resume_keywords - jd_keywords))
+        # Only the first 10 (alphabetically) are ever reported
+        missing_keywords = heapq.nsmallest(10, missing_set)
+        extra_keywords = heapq.nsmallest(10, resume_keywords - jd_keywords)
         
         # ========== ROLE DETECTION ==========
-        detected_role = detect_role_from_jd(job_desc)
+        detected_role = detect_role_from_jd(jd_lower)
         
         # ========== WEAK BULLET DETECTION ==========
-        weak_bullets = find_weak_bullets(resume_text)
-        weak_bullet = weak_bullets[0] if weak_bullets else "Worked on a project without metrics"
+        weak_bullets = find_weak_bullets(resume_text, resume_lower)
+        weak_bullet = weak_bullets[0] if weak_bullets else _DEFAULT_WEAK_BULLET
         
         # ========== REWRITE SUGGESTION ==========
         rewrite = generate_rewrite_suggestion(
@@ -415,8 +908,8 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
         suggestions = []
         
         # Missing keywords
-        if len(missing_keywords) > 0:
-            suggestions.append(f"Add {len(missing_keywords)} missing keywords: {', '.join(missing_keywords[:5])}")
+        if len(missing_set) > 0:
+            suggestions.append(f"Add {len(missing_set)} missing keywords: {', '.join(missing_keywords[:5])}")
         
         # Section-specific suggestions
         for sec, score in section_scores.items():
@@ -426,7 +919,7 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
                     suggestions.append(f"{sec.title()}: {sec_suggestions[0]}")
         
         # Metrics check
-        if not re.search(r'\d+%|\d+x|\$\d+', resume_text):
+        if not _RESUME_METRIC_RE.search(resume_text):
             suggestions.append("Add quantifiable metrics (%, $, numbers) to demonstrate impact")
         
         # Action verbs check
@@ -438,20 +931,19 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
             suggestions.append("Use standard section headers (Experience, Education, Skills)")
         
         # Length check
-        word_count = len(resume_text.split())
         if word_count < 300:
             suggestions.append("Resume is too short - aim for 400-600 words")
         elif word_count > 800:
             suggestions.append("Resume is too long - keep it concise (1-2 pages)")
         
         # ========== RETURN RESULTS ==========
-        return {
+        result = {
             "ats_score": final_ats,
             "global_similarity": f"{global_similarity:.2%}",
             "section_scores": section_scores,
             "section_details": section_details,
-            "missing_keywords": missing_keywords[:10],
-            "extra_keywords": extra_keywords[:10],
+            "missing_keywords": missing_keywords,
+            "extra_keywords": extra_keywords,
             "detected_role": detected_role,
             "weak_bullet": weak_bullet,
             "weak_bullets": weak_bullets[:3],
@@ -461,6 +953,11 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
             "word_count": word_count,
             "sections_found": [k for k, v in sections.items() if v.strip()]
         }
+        
+        # A transient encoder failure must not pin fallback scores to this pair
+        if encoded:
+            _cache_analysis(cache_key, result)
+        return result
     
     except Exception as e:
         traceback.print_exc()
@@ -488,3 +985,7 @@ def analyze_resume(resume_text: str, job_desc: str) -> Dict[str, Any]:
             "word_count": 0,
             "sections_found": []
         }
+
+
+# Start loading the model at import so it is ready by the first analysis
+threading.Thread(target=_warm_up_model, daemon=True).start()
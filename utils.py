@@ -1,13 +1,99 @@
 import re
 import io
 import logging
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
 from rapidfuzz import fuzz, process
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ============================================================
+# PRECOMPILED PATTERNS
+# ============================================================
+
+# Header normalisation
+_HEADER_PUNCT_RE = re.compile(r'[:\-–—_|]')
+
+# Column layout
+# A line with content, then 5+ spaces, then more content. Matched across the
+# whole text at once: at most one hit per line, never spanning a newline.
+_TWO_COLUMN_LINE_RE = re.compile(r'^[^\n]*?\w[^\S\n]{5,}\w', re.MULTILINE)
+_COLUMN_GAP_RE = re.compile(r'\s{5,}')
+
+# Whitespace normalisation. Single spaces are already normal, so only runs of
+# two or more are matched; the literal two-space prefix lets the engine skip
+# ahead instead of stopping (and substituting) at every space.
+_MULTI_SPACE_RE = re.compile(r'  +')
+_MULTI_BLANK_LINE_RE = re.compile(r'\n\s*\n\s*\n+')
+
+# ALL CAPS headings (converted to Title Case before header detection)
+_ALL_CAPS_HEADING_RE = re.compile(r"\n([A-Z][A-Z ]{3,})\n")
+
+# Enhanced heading patterns - detect multiple formats. Each is paired with the
+# terminator characters it needs, so a pattern whose terminator never occurs in
+# the text is skipped with a native substring check instead of a regex scan.
+_HEADING_PATTERNS = [
+    (re.compile(pattern, re.MULTILINE), required) for pattern, required in (
+        # Standard newline-separated headers
+        (r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*\n", "\n"),
+        
+        # Headers with colon
+        (r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*:", ":"),
+        
+        # Headers with pipe separator
+        (r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*\|", "|"),
+        
+        # Headers with dash/underscore
+        (r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*[-–—_]{2,}", "-–—_"),
+        
+        # All caps headers (before conversion)
+        (r"\n\s*([A-Z][A-Z ]{3,40})\s*\n", "\n"),
+        
+        # Headers at start of line with colon
+        (r"^([A-Za-z][A-Za-z &/]{2,40})\s*:", ":"),
+    )
+]
+
+# Extracted text cleanup
+_URL_RE = re.compile(r'http[s]?://\S+')
+
+# An email match always spans a whole whitespace-delimited run, so only try
+# at run starts instead of backtracking from every character
+_EMAIL_RE = re.compile(r'(?<!\S)\S+@\S+\.\S+')
+_DISALLOWED_CHARS_RE = re.compile(r'[^\w\s\.\,\-\(\)\[\]\+\#\:\;\/\&\%\@\*\'\"\n]')
+
+# Byte translation table equivalent to _DISALLOWED_CHARS_RE for ASCII text
+_ASCII_KEEP_TABLE = bytes(
+    0x20 if _DISALLOWED_CHARS_RE.match(chr(c)) else c for c in range(128)
+) + bytes(128)
+
+# Same test for every Basic Multilingual Plane code point, for text with
+# bullets, accents or smart quotes (i.e. most real resumes)
+_BMP_DISALLOWED = np.array([_DISALLOWED_CHARS_RE.match(chr(c)) is not None for c in range(0x10000)])
+
+def build_keyword_automaton(words):
+    """Aho-Corasick automaton over words (None if pyahocorasick is unavailable)"""
+    if ahocorasick is None or not words:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
 # ============================================================
 # ENHANCED SECTION PARSER (Multi-Column + Dynamic Detection)
 # ============================================================
@@ -68,73 +154,86 @@ SECTION_HEADERS = {
     ]
 }
 
-def find_best_section(header_text: str) -> Optional[str]:
-    """Enhanced fuzzy matching with multi-word support"""
+# Flattened (variation, canonical) choices for vectorised fuzzy matching, in
+# SECTION_HEADERS order; the first canonical listing a variation owns it
+_HEADER_CHOICES = tuple(v for variations in SECTION_HEADERS.values() for v in variations)
+_HEADER_CANONICALS = tuple(c for c, variations in SECTION_HEADERS.items() for _ in variations)
+_EXACT_HEADERS = {}
+for _variation, _canonical in zip(_HEADER_CHOICES, _HEADER_CANONICALS):
+    _EXACT_HEADERS.setdefault(_variation, _canonical)
+_HEADER_SCORERS = (fuzz.ratio, fuzz.partial_ratio, fuzz.token_sort_ratio)
+
+def _normalize_header(header_text: str) -> str:
+    """Lowercase, strip header punctuation and collapse whitespace"""
     header_text = header_text.lower().strip()
     
     # Remove common punctuation that might interfere
-    header_text = re.sub(r'[:\-–—_|]', ' ', header_text)
-    header_text = ' '.join(header_text.split())
-    
-    best_match = None
-    best_score = 0
+    header_text = _HEADER_PUNCT_RE.sub(' ', header_text)
+    return ' '.join(header_text.split())
 
-    for canonical, variations in SECTION_HEADERS.items():
-        for v in variations:
-            # Try exact match first
-            if header_text == v:
-                return canonical
-            
-            # Fuzzy match
-            score = fuzz.ratio(header_text, v)
-            
-            # Partial match for multi-word headers
-            partial_score = fuzz.partial_ratio(header_text, v)
-            
-            # Token sort for word order independence
-            token_score = fuzz.token_sort_ratio(header_text, v)
-            
-            # Take best score
-            max_score = max(score, partial_score, token_score)
-            
-            if max_score > best_score:
-                best_match = canonical
-                best_score = max_score
 
+def find_best_section(header_text: str) -> Optional[str]:
+    """Enhanced fuzzy matching with multi-word support"""
+    return _match_section(_normalize_header(header_text))
+
+
+@lru_cache(maxsize=4096)
+def _match_section(header_text: str) -> Optional[str]:
+    """Canonical section for a normalised header; the same few headers recur across resumes"""
+    # Try exact match first
+    exact = _EXACT_HEADERS.get(header_text)
+    if exact is not None:
+        return exact
+    
+    # Fuzzy, partial (multi-word headers) and token-sort (word order) scores
+    # against every variation at once; each variation keeps its best score
+    queries = [header_text]
+    scores = np.maximum.reduce([
+        process.cdist(queries, _HEADER_CHOICES, scorer=scorer, dtype=np.float64)[0]
+        for scorer in _HEADER_SCORERS
+    ])
+    
+    # First variation with the top score wins, as in a strict '>' scan
+    best = int(np.argmax(scores))
+    
     # More lenient threshold for better detection
-    return best_match if best_score >= 55 else None
+    return _HEADER_CANONICALS[best] if scores[best] >= 55 else None
+
+
+# Resets the memoised header matches (e.g. between tests)
+find_best_section.cache_clear = _match_section.cache_clear
 
 
 def detect_column_layout(text: str) -> bool:
     """Detect if resume has two-column layout"""
-    lines = text.split('\n')
+    # Check first 50 lines: find where the 50th line ends
+    end = -1
+    for _ in range(50):
+        end = text.find('\n', end + 1)
+        if end == -1:
+            end = len(text)
+            break
     
     # Check for multiple short lines with content on both sides
     multi_column_indicators = 0
     
-    for line in lines[:50]:  # Check first 50 lines
-        # Look for lines with content, then spaces, then more content
-        if re.search(r'\w+\s{5,}\w+', line):
-            multi_column_indicators += 1
+    for _ in _TWO_COLUMN_LINE_RE.finditer(text, 0, end):
+        multi_column_indicators += 1
+        if multi_column_indicators > 3:
+            return True
     
-    return multi_column_indicators > 3
+    return False
 
 
 def split_two_column_text(text: str) -> str:
     """Split two-column layout into single column"""
-    lines = text.split('\n')
-    processed_lines = []
+    # Turn every gap of 5+ whitespace into a line break in one pass; a gap
+    # that spans a newline only loses whitespace the strip below drops anyway
+    text = _COLUMN_GAP_RE.sub('\n', text)
     
-    for line in lines:
-        # Find positions where there are 5+ consecutive spaces
-        parts = re.split(r'\s{5,}', line)
-        
-        # Add each part as separate line
-        for part in parts:
-            if part.strip():
-                processed_lines.append(part.strip())
-    
-    return '\n'.join(processed_lines)
+    # Each non-blank part on its own line
+    parts = (line.strip() for line in text.split('\n'))
+    return '\n'.join(filter(None, parts))
 
 
 def clean_text(t: str) -> str:
@@ -143,8 +242,8 @@ def clean_text(t: str) -> str:
         return ""
     
     # Normalize whitespace but keep newlines
-    t = re.sub(r' +', ' ', t)
-    t = re.sub(r'\n\s*\n\s*\n+', '\n\n', t)
+    t = _MULTI_SPACE_RE.sub(' ', t)
+    t = _MULTI_BLANK_LINE_RE.sub('\n\n', t)
     
     return t.strip()
 
@@ -173,39 +272,18 @@ def parse_resume_sections(text: str) -> Dict[str, str]:
         text = split_two_column_text(text)
     
     # Convert ALL CAPS headings to Title Case
-    text = re.sub(
-        r"\n([A-Z][A-Z ]{3,})\n",
+    text = _ALL_CAPS_HEADING_RE.sub(
         lambda m: "\n" + m.group(1).title() + "\n",
         text
     )
     
-    # Enhanced heading pattern - detects multiple formats
-    heading_patterns = [
-        # Standard newline-separated headers
-        r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*\n",
-        
-        # Headers with colon
-        r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*:",
-        
-        # Headers with pipe separator
-        r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*\|",
-        
-        # Headers with dash/underscore
-        r"\n\s*([A-Za-z][A-Za-z &/]{2,40})\s*[-–—_]{2,}",
-        
-        # All caps headers (before conversion)
-        r"\n\s*([A-Z][A-Z ]{3,40})\s*\n",
-        
-        # Headers at start of line with colon
-        r"^([A-Za-z][A-Za-z &/]{2,40})\s*:",
-    ]
-    
     # Find all potential headers using all patterns
     all_matches = []
     
-    for pattern in heading_patterns:
-        matches = list(re.finditer(pattern, text, re.MULTILINE))
-        for match in matches:
+    for pattern, required in _HEADING_PATTERNS:
+        if not any(c in text for c in required):
+            continue
+        for match in pattern.finditer(text):
             header_text = match.group(1).strip()
             
             # Filter out common false positives
@@ -237,6 +315,12 @@ def parse_resume_sections(text: str) -> Dict[str, str]:
         sections["summary"] = text[:500] if len(text) > 500 else text
         return sections
     
+    # Cleaned bodies per section, joined once after the loop
+    parts = {k: [] for k in SECTION_HEADERS.keys()}
+    
+    # Resolve each distinct header string once
+    resolved = {h: find_best_section(h) for h in {m['text'] for m in unique_matches if m['text']}}
+    
     # Process each match
     for i, match in enumerate(unique_matches):
         header_raw = match['text']
@@ -248,22 +332,25 @@ def parse_resume_sections(text: str) -> Dict[str, str]:
         start = match['end']
         end = unique_matches[i+1]['start'] if i+1 < len(unique_matches) else len(text)
         
-        body = text[start:end].strip()
+        # clean_text strips the ends itself
+        body = text[start:end]
         
         # Match to canonical section
-        best = find_best_section(header_raw)
+        best = resolved[header_raw]
         
         if best:
-            # Append content (allow multiple sections with same name)
-            if sections[best]:
-                sections[best] += "\n\n" + clean_text(body)
-            else:
-                sections[best] = clean_text(body)
+            # Append content (allow multiple sections with same name);
+            # empty bodies before a section's first content are dropped
+            content = clean_text(body)
+            if content or parts[best]:
+                parts[best].append(content)
             
-            logger.info(f"✅ Detected: {header_raw} → {best} ({len(body)} chars)")
+            logger.info(f"✅ Detected: {header_raw} → {best} ({len(content)} chars)")
         else:
             logger.debug(f"❌ Unmatched header: {header_raw}")
     
+    sections = {k: "\n\n".join(v) for k, v in parts.items()}
+    
     # Post-processing: If sections are empty, try alternate extraction
     if not any(sections.values()):
         logger.warning("⚠️ No content extracted, trying alternate method")
@@ -274,7 +361,8 @@ def parse_resume_sections(text: str) -> Dict[str, str]:
 
 def fallback_extraction(text: str) -> Dict[str, str]:
     """Fallback method for difficult resumes"""
-    sections = {k: "" for k in SECTION_HEADERS.keys()}
+    # Cleaned blocks per section, joined once at the end
+    parts = {k: [] for k in SECTION_HEADERS.keys()}
     
     # Split by double newlines
     blocks = text.split('\n\n')
@@ -285,102 +373,198 @@ def fallback_extraction(text: str) -> Dict[str, str]:
             continue
         
         # Check first line for section name
-        first_line = block.split('\n')[0].strip()
+        first_line, _, content = block.partition('\n')
         
-        matched_section = find_best_section(first_line)
+        matched_section = find_best_section(first_line.strip())
         
         if matched_section:
-            content = '\n'.join(block.split('\n')[1:])
-            sections[matched_section] += "\n" + clean_text(content)
+            parts[matched_section].append(clean_text(content))
         else:
             # Add to summary if no match
-            sections["summary"] += "\n" + clean_text(block)
+            parts["summary"].append(clean_text(block))
     
-    return sections
+    return {k: "".join("\n" + p for p in v) for k, v in parts.items()}
 
 
 # ============================================================
 # ROBUST FILE EXTRACTION
 # ============================================================
 
+def _page_text(page) -> str:
+    """Text of one page, releasing the page's cached layout objects once read"""
+    page_text = page.extract_text() or ''
+    # pdfplumber keeps every char/rect/line of a page alive until flushed
+    flush_cache = getattr(page, 'flush_cache', None)
+    if flush_cache is not None:
+        flush_cache()
+    return page_text
+
+
+def _join_page_texts(pages) -> str:
+    """Extract every page and join the non-empty texts in one pass"""
+    page_texts = []
+    for page in pages:
+        page_text = _page_text(page)
+        if page_text:
+            page_texts.append(page_text)
+    return "\n".join(page_texts)
+
+
+def _extract_pdf_pages(open_pdf, data: bytes) -> str:
+    """Extract all pages of open_pdf(stream).pages in order"""
+    # The pure-Python parsers hold the GIL, so pages are read serially: worker
+    # threads only added contention plus a full re-parse of the PDF per worker
+    pdf_reader = open_pdf(io.BytesIO(data))
+    try:
+        return _join_page_texts(pdf_reader.pages)
+    finally:
+        # pdfplumber readers hold parsed objects and the stream until closed
+        close = getattr(pdf_reader, 'close', None)
+        if close is not None:
+            close()
+
+
+# Optional extraction backends, imported on first use. Failed imports are
+# remembered too, so a missing parser doesn't cost a sys.path search per upload.
+_BACKENDS = {}
+
+
+def _import_backend(name: str):
+    """Import an optional backend module once; raises ImportError if it is missing"""
+    if name not in _BACKENDS:
+        try:
+            _BACKENDS[name] = importlib.import_module(name)
+        except ImportError as e:
+            _BACKENDS[name] = e
+    backend = _BACKENDS[name]
+    if isinstance(backend, ImportError):
+        raise ImportError(str(backend))
+    return backend
+
+
+# MuPDF is not thread-safe: PyMuPDF calls are serialised across threads
+_PYMUPDF_LOCK = threading.Lock()
+
+
+def _read_upload(file) -> bytes:
+    """Read an uploaded file once; each parser then gets its own in-memory stream"""
+    file.seek(0)
+    return file.read()
+
+
+# Fallback-parser output shorter than this that also fails the resume-indicator
+# check is treated as partial (e.g. only a header) and the next parser is tried
+_MIN_COMPLETE_CHARS = 200
+
+
+def _is_complete_extraction(text: str) -> bool:
+    """Whether extracted text looks like the whole resume rather than a fragment"""
+    stripped_len = len(text.strip())
+    if stripped_len >= _MIN_COMPLETE_CHARS:
+        return True
+    return stripped_len > 0 and _count_resume_indicators(text.lower()) >= _MIN_RESUME_INDICATORS
+
+
+class _ImageOnlyPDF(Exception):
+    """Raised when MuPDF reads the PDF fine but finds no text layer"""
+
+
+def _pdf_text_pymupdf(data: bytes) -> str:
+    """Method 1: PyMuPDF (native MuPDF parser, fastest when installed)"""
+    fitz = _import_backend("fitz")
+    with _PYMUPDF_LOCK, fitz.open(stream=data, filetype="pdf") as doc:
+        text = "\n".join(page.get_text("text") for page in doc)
+        # A readable, unencrypted PDF without a text layer is a scan
+        if not text.strip() and doc.page_count > 0 and not doc.needs_pass:
+            raise _ImageOnlyPDF()
+    return text
+
+
+def _pdf_text_pypdf2(data: bytes) -> str:
+    """Method 2: PyPDF2"""
+    return _extract_pdf_pages(_import_backend("PyPDF2").PdfReader, data)
+
+
+def _pdf_text_pdfplumber(data: bytes) -> str:
+    """Method 3: pdfplumber"""
+    return _extract_pdf_pages(_import_backend("pdfplumber").open, data)
+
+
+def _pdf_text_pypdf(data: bytes) -> str:
+    """Method 4: pypdf"""
+    return _extract_pdf_pages(_import_backend("pypdf").PdfReader, data)
+
+
+def _pdf_text_pdfminer(data: bytes) -> str:
+    """Method 5: PDFMiner"""
+    return _import_backend("pdfminer.high_level").extract_text(io.BytesIO(data))
+
+
+# Fallback chain, fastest first
+_PDF_METHODS = (
+    ("PyMuPDF", _pdf_text_pymupdf),
+    ("PyPDF2", _pdf_text_pypdf2),
+    ("pdfplumber", _pdf_text_pdfplumber),
+    ("pypdf", _pdf_text_pypdf),
+    ("pdfminer", _pdf_text_pdfminer),
+)
+
+# Method that last produced a complete extraction, keyed by a digest of the
+# file, so a re-upload goes straight to it instead of repeating failed parsers
+_PDF_METHOD_CACHE_SIZE = 256
+_pdf_method_cache = OrderedDict()
+_pdf_method_cache_lock = threading.Lock()
+
+
 def extract_text_from_pdf(file) -> str:
     """Robust PDF extraction with multiple fallback methods"""
-    text = ""
+    # Longest partial result, used only if no parser produces a complete one
+    best_text = ""
     methods_tried = []
-    
-    # Method 1: PyPDF2
-    try:
-        from PyPDF2 import PdfReader
-        file.seek(0)
-        pdf_reader = PdfReader(file)
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        
-        if text.strip():
-            logger.info("✅ PyPDF2 extraction successful")
-            return clean_extracted_text(text)
-        methods_tried.append("PyPDF2 (no text)")
-    except Exception as e:
-        methods_tried.append(f"PyPDF2 (error: {str(e)[:50]})")
-        logger.warning(f"⚠️ PyPDF2 failed: {str(e)[:100]}")
-    
-    # Method 2: pdfplumber
-    try:
-        import pdfplumber
-        file.seek(0)
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if text.strip():
-            logger.info("✅ pdfplumber extraction successful")
-            return clean_extracted_text(text)
-        methods_tried.append("pdfplumber (no text)")
-    except ImportError:
-        methods_tried.append("pdfplumber (not installed)")
-    except Exception as e:
-        methods_tried.append(f"pdfplumber (error: {str(e)[:50]})")
-        logger.warning(f"⚠️ pdfplumber failed: {str(e)[:100]}")
-    
-    # Method 3: pypdf
-    try:
-        from pypdf import PdfReader as PyPdfReader
-        file.seek(0)
-        pdf_reader = PyPdfReader(file)
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        
-        if text.strip():
-            logger.info("✅ pypdf extraction successful")
-            return clean_extracted_text(text)
-        methods_tried.append("pypdf (no text)")
-    except ImportError:
-        methods_tried.append("pypdf (not installed)")
-    except Exception as e:
-        methods_tried.append(f"pypdf (error: {str(e)[:50]})")
-        logger.warning(f"⚠️ pypdf failed: {str(e)[:100]}")
-    
-    # Method 4: PDFMiner
-    try:
-        from pdfminer.high_level import extract_text as pdfminer_extract
-        file.seek(0)
-        text = pdfminer_extract(file)
-        
-        if text.strip():
-            logger.info("✅ pdfminer extraction successful")
-            return clean_extracted_text(text)
-        methods_tried.append("pdfminer (no text)")
-    except ImportError:
-        methods_tried.append("pdfminer (not installed)")
-    except Exception as e:
-        methods_tried.append(f"pdfminer (error: {str(e)[:50]})")
-        logger.warning(f"⚠️ pdfminer failed: {str(e)[:100]}")
+    data = _read_upload(file)
+    
+    signature = hashlib.blake2b(data, digest_size=16).digest()
+    with _pdf_method_cache_lock:
+        winner = _pdf_method_cache.get(signature)
+        if winner is not None:
+            _pdf_method_cache.move_to_end(signature)
+    methods = sorted(_PDF_METHODS, key=lambda method: method[0] != winner)
+    
+    for name, extract in methods:
+        try:
+            text = extract(data)
+            
+            # MuPDF reads the whole text layer, so any text it finds is final
+            if (name == "PyMuPDF" and text.strip()) or _is_complete_extraction(text):
+                logger.info(f"✅ {name} extraction successful")
+                with _pdf_method_cache_lock:
+                    _pdf_method_cache[signature] = name
+                    _pdf_method_cache.move_to_end(signature)
+                    while len(_pdf_method_cache) > _PDF_METHOD_CACHE_SIZE:
+                        _pdf_method_cache.popitem(last=False)
+                return clean_extracted_text(text)
+            if len(text.strip()) > len(best_text.strip()):
+                best_text = text
+            methods_tried.append(f"{name} (no text)" if not text.strip() else f"{name} (partial text)")
+        except _ImageOnlyPDF:
+            # The pure-Python parsers cannot find text MuPDF didn't, so don't try them
+            if not best_text.strip():
+                logger.error("❌ PDF has no text layer (scanned document)")
+                raise ValueError(
+                    "Unable to extract text from PDF.\n\nThe PDF contains only images (scanned). "
+                    "Please upload a text-based PDF or DOCX."
+                )
+            methods_tried.append(f"{name} (no text)")
+        except ImportError:
+            methods_tried.append(f"{name} (not installed)")
+        except Exception as e:
+            methods_tried.append(f"{name} (error: {str(e)[:50]})")
+            logger.warning(f"⚠️ {name} failed: {str(e)[:100]}")
+    
+    # No parser looked complete: fall back to the most text any of them found
+    if best_text.strip():
+        logger.info("✅ Using the most complete partial PDF extraction")
+        return clean_extracted_text(best_text)
     
     # All methods failed
     error_msg = f"Unable to extract text from PDF.\n\nMethods tried:\n" + "\n".join(f"• {m}" for m in methods_tried)
@@ -394,16 +578,15 @@ def extract_text_from_docx(file) -> str:
     """Robust DOCX extraction with fallback methods"""
     text = ""
     methods_tried = []
+    data = _read_upload(file)
     
     # Method 1: python-docx
     try:
-        from docx import Document
-        file.seek(0)
-        doc = Document(file)
+        Document = _import_backend("docx").Document
+        doc = Document(io.BytesIO(data))
         
         # Extract from paragraphs
-        paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
-        text = "\n".join(paragraphs)
+        lines = [para.text for para in doc.paragraphs if para.text.strip()]
         
         # Extract from tables
         for table in doc.tables:
@@ -413,7 +596,8 @@ def extract_text_from_docx(file) -> str:
                     if cell.text.strip():
                         row_text.append(cell.text.strip())
                 if row_text:
-                    text += "\n" + "     ".join(row_text)  # 5 spaces for column separation
+                    lines.append("     ".join(row_text))  # 5 spaces for column separation
+        text = "\n".join(lines)
         
         if text.strip():
             logger.info("✅ python-docx extraction successful")
@@ -425,9 +609,8 @@ def extract_text_from_docx(file) -> str:
     
     # Method 2: docx2txt
     try:
-        import docx2txt
-        file.seek(0)
-        text = docx2txt.process(file)
+        docx2txt = _import_backend("docx2txt")
+        text = docx2txt.process(io.BytesIO(data))
         
         if text.strip():
             logger.info("✅ docx2txt extraction successful")
@@ -442,21 +625,43 @@ def extract_text_from_docx(file) -> str:
     # Method 3: XML extraction
     try:
         import zipfile
-        from xml.etree import ElementTree as ET
+        try:
+            etree = _import_backend("lxml.etree")
+        except ImportError:
+            from xml.etree import ElementTree as etree
         
-        file.seek(0)
-        with zipfile.ZipFile(file, 'r') as docx_zip:
-            xml_content = docx_zip.read('word/document.xml')
-            tree = ET.fromstring(xml_content)
-            
-            namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            paragraphs = tree.findall('.//w:p', namespaces)
-            
-            for para in paragraphs:
-                texts = para.findall('.//w:t', namespaces)
-                para_text = ''.join([t.text for t in texts if t.text])
-                if para_text.strip():
-                    text += para_text + "\n"
+        w = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+        para_tag, text_tag = w + 'p', w + 't'
+        
+        # Stream paragraphs straight from the archive, freeing each once read,
+        # instead of building the whole document tree in memory
+        para_texts = []
+        depth = 0
+        with zipfile.ZipFile(io.BytesIO(data), 'r') as docx_zip:
+            with docx_zip.open('word/document.xml') as xml_file:
+                for event, para in etree.iterparse(xml_file, events=('start', 'end')):
+                    if para.tag != para_tag:
+                        continue
+                    if event == 'start':
+                        depth += 1
+                        continue
+                    depth -= 1
+                    if depth:
+                        # Paragraph inside a text box: read with its host paragraph
+                        continue
+                    
+                    # Host paragraph first, then its text-box paragraphs, in document order
+                    for p in para.iter(para_tag):
+                        para_text = ''.join([t.text for t in p.iter(text_tag) if t.text])
+                        if para_text.strip():
+                            para_texts.append(para_text)
+                    para.clear()
+                    
+                    # lxml can also detach the emptied elements already read
+                    if hasattr(para, 'getprevious'):
+                        while para.getprevious() is not None:
+                            del para.getparent()[0]
+        text = "\n".join(para_texts)
         
         if text.strip():
             logger.info("✅ XML extraction successful")
@@ -474,73 +679,128 @@ def extract_text_from_docx(file) -> str:
     raise ValueError(error_msg)
 
 
+def _replace_disallowed_chars(text: str) -> str:
+    """Replace every _DISALLOWED_CHARS_RE character with a space via lookup tables"""
+    if text.isascii():
+        return text.encode('ascii').translate(_ASCII_KEEP_TABLE).decode('ascii')
+    
+    code_points = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    if code_points.max() > 0xFFFF:
+        # Emoji and other astral characters: outside the table
+        return _DISALLOWED_CHARS_RE.sub(' ', text)
+    code_points = np.where(_BMP_DISALLOWED[code_points], np.uint32(0x20), code_points)
+    return code_points.tobytes().decode('utf-32-le', 'surrogatepass')
+
+
 def clean_extracted_text(text: str) -> str:
     """Clean extracted text while preserving structure"""
     if not text:
         return ""
     
     # Replace URLs with placeholder
-    text = re.sub(r'http[s]?://\S+', ' [URL] ', text)
+    if '://' in text:
+        text = _URL_RE.sub(' [URL] ', text)
     
     # Replace email with placeholder
-    text = re.sub(r'\S+@\S+\.\S+', ' [EMAIL] ', text)
+    if '@' in text:
+        text = _EMAIL_RE.sub(' [EMAIL] ', text)
     
     # Remove problematic special characters but keep structure
-    text = re.sub(r'[^\w\s\.\,\-\(\)\[\]\+\#\:\;\/\&\%\@\*\'\"\n]', ' ', text)
+    text = _replace_disallowed_chars(text)
     
     # Normalize whitespace
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    text = _MULTI_BLANK_LINE_RE.sub('\n\n', text)
     
     return text.strip()
 
 
+# Comprehensive resume indicators, most common first so the substring
+# fallback usually reaches the threshold within the first few checks
+_RESUME_INDICATORS = (
+    # Section headers
+    'experience', 'education', 'skills', 'project', 'summary', 
+    'objective', 'profile', 'qualification', 'certification',
+    'achievement', 'internship', 'training', 'award',
+    
+    # Educational terms
+    'bachelor', 'master', 'degree', 'university', 'college',
+    'school', 'graduate', 'undergraduate', 'btech', 'mtech',
+    'bsc', 'msc', 'diploma', 'cgpa', 'gpa', 'percentage',
+    
+    # Work terms
+    'work', 'intern', 'job', 'role', 'position', 'responsibilities',
+    'company', 'organization', 'team', 'developed', 'managed',
+    'led', 'designed', 'implemented', 'built', 'created',
+    
+    # Technical terms
+    'python', 'java', 'javascript', 'react', 'node', 'sql',
+    'html', 'css', 'programming', 'software', 'developer',
+    'engineer', 'data', 'analysis', 'machine learning', 'ai',
+    
+    # Time indicators
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december',
+    '2020', '2021', '2022', '2023', '2024', '2025',
+    'present', 'current', 'ongoing',
+    
+    # Contact indicators
+    'email', 'phone', 'linkedin', 'github', 'portfolio',
+)
+
+# Single-pass matcher over all indicators
+_RESUME_INDICATOR_AUTOMATON = build_keyword_automaton(_RESUME_INDICATORS)
+
+# Every byte except the ASCII letters, for counting letters with bytes.translate
+_NON_ALPHA_BYTES = bytes(c for c in range(256) if not (c < 128 and chr(c).isalpha()))
+
+
+def _count_alpha(text: str) -> int:
+    """Count alphabetic characters, same as sum(c.isalpha() for c in text)"""
+    ascii_bytes = text.encode('ascii', 'ignore')
+    count = len(ascii_bytes.translate(None, _NON_ALPHA_BYTES))
+    if len(ascii_bytes) != len(text):
+        # Only the (usually few) non-ASCII code points need str.isalpha
+        code_points = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        count += sum(chr(c).isalpha() for c in code_points[code_points > 127].tolist())
+    return count
+
+
+# Distinct indicators a document needs to pass as a resume
+_MIN_RESUME_INDICATORS = 2
+
+
+def _count_resume_indicators(text_lower: str) -> int:
+    """Distinct resume indicators in text_lower, counting no further than the threshold"""
+    if _RESUME_INDICATOR_AUTOMATON is not None:
+        # Only the threshold matters: stop scanning at the second distinct indicator
+        seen = set()
+        for _, indicator in _RESUME_INDICATOR_AUTOMATON.iter(text_lower):
+            seen.add(indicator)
+            if len(seen) >= _MIN_RESUME_INDICATORS:
+                break
+        return len(seen)
+    
+    found_indicators = 0
+    for indicator in _RESUME_INDICATORS:
+        if indicator in text_lower:
+            found_indicators += 1
+            if found_indicators >= _MIN_RESUME_INDICATORS:
+                break
+    return found_indicators
+
+
 def validate_resume_content(text: str) -> Tuple[bool, str]:
     """Validate if extracted text is actually a resume"""
     if not text or len(text.strip()) < 50:
         return False, "Extracted text is too short (less than 50 characters)."
     
-    # Comprehensive resume indicators
-    resume_indicators = [
-        # Section headers
-        'experience', 'education', 'skills', 'project', 'summary', 
-        'objective', 'profile', 'qualification', 'certification',
-        'achievement', 'internship', 'training', 'award',
-        
-        # Educational terms
-        'bachelor', 'master', 'degree', 'university', 'college',
-        'school', 'graduate', 'undergraduate', 'btech', 'mtech',
-        'bsc', 'msc', 'diploma', 'cgpa', 'gpa', 'percentage',
-        
-        # Work terms
-        'work', 'intern', 'job', 'role', 'position', 'responsibilities',
-        'company', 'organization', 'team', 'developed', 'managed',
-        'led', 'designed', 'implemented', 'built', 'created',
-        
-        # Technical terms
-        'python', 'java', 'javascript', 'react', 'node', 'sql',
-        'html', 'css', 'programming', 'software', 'developer',
-        'engineer', 'data', 'analysis', 'machine learning', 'ai',
-        
-        # Time indicators
-        'january', 'february', 'march', 'april', 'may', 'june',
-        'july', 'august', 'september', 'october', 'november', 'december',
-        '2020', '2021', '2022', '2023', '2024', '2025',
-        'present', 'current', 'ongoing',
-        
-        # Contact indicators
-        'email', 'phone', 'linkedin', 'github', 'portfolio',
-    ]
-    
-    text_lower = text.lower()
-    found_indicators = sum(1 for indicator in resume_indicators if indicator in text_lower)
-    
-    if found_indicators < 2:
+    if _count_resume_indicators(text.lower()) < _MIN_RESUME_INDICATORS:
         return False, "File doesn't appear to be a resume. Please upload a valid resume."
     
     # Check if mostly gibberish
-    alpha_chars = sum(c.isalpha() for c in text)
-    total_chars = len(text.replace(' ', ''))
+    alpha_chars = _count_alpha(text)
+    total_chars = len(text) - text.count(' ')
     
     if total_chars > 0 and alpha_chars / total_chars < 0.3:
         return False, "Extracted text appears corrupted."